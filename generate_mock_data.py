@@ -4,11 +4,30 @@ Generate realistic mock decision log data for 4 paper traders.
 Each trader has a distinct personality and performance profile.
 """
 
+import argparse
 import json
 import os
-import random
-import math
+import queue
+import threading
+from bisect import bisect
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
+from itertools import repeat
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the jitted kernels run as plain NumPy
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
 
 # PST timezone
 PST = timezone(timedelta(hours=-8))
@@ -36,7 +55,16 @@ COIN_PRICES_BASE = {
     "HYPEUSDT": 45.0,
 }
 
-CANDIDATE_COINS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "DOGEUSDT", "XRPUSDT", "ADAUSDT", "HYPEUSDT"]
+CANDIDATE_COINS = ("BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "DOGEUSDT", "XRPUSDT", "ADAUSDT", "HYPEUSDT")
+
+# Coins are handled as indices into CANDIDATE_COINS (and into each per-step price row)
+COIN_IDX = {coin: i for i, coin in enumerate(CANDIDATE_COINS)}
+BTC, ETH, SOL, BNB, DOGE, XRP, ADA, HYPE = range(len(CANDIDATE_COINS))
+
+# candidate_coins is identical in every record: serialize it once and splice it in
+CANDIDATE_COINS_PLACEHOLDER = "__candidate_coins__"
+CANDIDATE_COINS_TOKEN = json.dumps(CANDIDATE_COINS_PLACEHOLDER).encode("utf-8")
+CANDIDATE_COINS_JSON = json.dumps(CANDIDATE_COINS, separators=(",", ":")).encode("utf-8")
 
 # Time range: Jan 1 - Jan 30, 2026, hourly
 START = datetime(2026, 1, 1, 0, 0, 0, tzinfo=PST)
@@ -45,255 +73,340 @@ INTERVAL = timedelta(hours=1)
 
 INITIAL_BALANCE = 10000.0
 
+# File name used instead of per-cycle files with --ndjson
+NDJSON_NAME = "decisions.ndjson"
+
+# Serialized records buffered between a trader's generator and its writer thread
+WRITE_QUEUE_SIZE = 64
+
+# Coin pools each trader draws from
+BTC_ETH = (BTC, ETH)
+BTC_ETH_SET = frozenset(BTC_ETH)
+MAJORS = (BTC, ETH, SOL)
+MAJORS_CUM_WEIGHTS = (0.5, 0.85, 1.0)  # 50/35/15
+GEMINI_POOL = (SOL, BTC, ETH, DOGE, BNB, XRP)
+DEEPSEEK_POOL = (BTC, ETH, SOL, BNB)
+
+# Cumulative weights for picking how many positions to hold
+UP_TO_2_CUM_WEIGHTS = (0.6, 1.0)  # 1 or 2 positions: 60/40
+UP_TO_3_CUM_WEIGHTS = (0.3, 0.7, 1.0)  # 1, 2 or 3 positions: 30/40/30
+
+# Probability that a cycle trades instead of waiting/holding
+ACTION_PROBS = {"grok4": 0.22, "gpt5": 0.10, "gemini": 0.32, "deepseek": 0.18}
+
+# trader -> (long probability, BTC/ETH leverage choices, alt leverage choices) for new entries
+DIRECTION_PROFILES = {
+    "grok4": (0.72, (3, 5), (3, 5)),
+    "gpt5": (0.82, (2, 3), (2, 3)),
+    "gemini": (0.50, (2, 3), (2, 3)),
+    "deepseek": (0.55, (3, 5), (2, 3)),
+}
+DEFAULT_DIRECTION_PROFILE = (0.5, (3,), (2,))
+
+# trader -> (min, max) simulated AI call duration in ms
+AI_DURATION_RANGES = {"grok4": (2000, 8000), "gpt5": (3000, 12000), "gemini": (2500, 10000), "deepseek": (4000, 15000)}
+
+WAIT_REASONS = (
+    "No high-confidence setup found",
+    "RSI near oversold, waiting for confirmation",
+    "Trend unclear, maintaining positions",
+    "Waiting for breakout confirmation",
+    "Market consolidating, holding",
+    "Risk-reward not favorable",
+    "Indicators conflicting, staying out",
+    "Volatility too low for entry",
+    "4h EMA20 ≈ EMA50, no clear trend",
+    "KEMAD and ZeroLag not aligned",
+)
+
 
 def smooth_curve(values, window=5):
-    """Simple moving average smoother."""
-    result = list(values)
-    for i in range(window, len(result) - window):
-        result[i] = sum(values[i-window:i+window+1]) / (2*window + 1)
+    """Simple moving average smoother. Edge points are left untouched."""
+    values = np.asarray(values, dtype=np.float64)
+    result = values.copy()
+    span = 2 * window + 1
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    result[window:len(values) - window] = (csum[span:] - csum[:-span]) / span
     return result
 
 
-def generate_equity_curve_v2(n_points, personality):
+# Target-path component kinds; see _build_target for the meaning of (a, b, c)
+LINEAR, SINE, GAUSS, ARCH, DECAY, RAMP = range(6)
+
+# personality -> (target path components as (kind, a, b, c), noise sigma)
+PERSONALITIES = {
+    # Grok-4: +18% over 30 days. Steady climb with small drawdowns.
+    "star": ([
+        (LINEAR, 10000, 1800, 0),     # Main upward trend: starts at 10000, ends at 11800
+        (GAUSS, -200, 0.30, 0.02),    # Small dip around day 8-10 (t=0.27-0.33)
+        (GAUSS, -150, 0.67, 0.015),   # Another small dip around day 20 (t=0.67)
+        (SINE, 200, 0.5, 0),          # Acceleration in the middle
+    ], 20),
+    # GPT-5: +8% over 30 days. Very smooth, almost linear.
+    "conservative": ([
+        (LINEAR, 10000, 800, 0),
+        (SINE, 50, 3, 0),             # Tiny seasonal variation
+        (GAUSS, -80, 0.5, 0.05),      # One small flat period around day 15
+    ], 10),
+    # Gemini: +3% final, but swings ±15%. Roller coaster.
+    "volatile": ([
+        (LINEAR, 10000, 300, 0),      # Final target: 10300
+        (SINE, 800, 1.5, 0),          # Up to +8%, oscillating
+        (SINE, 500, 3.2, 1),          # Faster oscillation
+        (GAUSS, -600, 0.55, 0.04),    # Big crash mid-month
+        (GAUSS, 400, 0.35, 0.03),     # Big rally
+    ], 35),
+    # DeepSeek: -5% final. Good start, then bad week, partial recovery.
+    # Rises to +6% by day 10-12, crashes to -10% by day 20, recovers to -5%
+    "underperformer": ([
+        (LINEAR, 10000, -100, 0),     # Drift down to hit -5% at end
+        (ARCH, 600, 0.0, 0.4),        # Initial rise
+        (DECAY, 600, 0.4, 3),         # ...fading out after day 12
+        (ARCH, -1200, 0.4, 0.35),     # Big drawdown
+        (RAMP, 300, 0.75, 0.25),      # Recovery
+    ], 18),
+}
+
+
+@njit(cache=True)
+def _build_target(t, kinds, params):
+    """
+    Sum target-path components over the time axis t (0 to 1).
+    Each row of params is (a, b, c) for the matching kind:
+      LINEAR  a + b*t
+      SINE    a * sin(2*pi*b*t + c)
+      GAUSS   bump of height a centred at b with std dev c
+      ARCH    a * half sine wave over b < t < b + c
+      DECAY   a * exp(-c * (t - b)) from t >= b
+      RAMP    a * (t - b) / c from t > b
+    """
+    target = np.zeros_like(t)
+    for k in range(kinds.shape[0]):
+        kind = kinds[k]
+        a, b, c = params[k, 0], params[k, 1], params[k, 2]
+        if kind == LINEAR:
+            target += a + b * t
+        elif kind == SINE:
+            target += a * np.sin(2 * np.pi * t * b + c)
+        elif kind == GAUSS:
+            target += a * np.exp(-((t - b) ** 2) / (2 * c ** 2))
+        elif kind == ARCH:
+            target += np.where((t > b) & (t < b + c), a * np.maximum(0.0, np.sin(np.pi * (t - b) / c)), 0.0)
+        elif kind == DECAY:
+            target += np.where(t >= b, a * np.exp(-c * (t - b)), 0.0)
+        elif kind == RAMP:
+            target += np.where(t > b, a * (t - b) / c, 0.0)
+    return target
+
+
+def generate_equity_curve_v2(n_points, personality, rng):
     """
     Generate a realistic equity curve using a target path + controlled noise.
     Returns list of balances of length n_points.
     """
-    if personality == "star":
-        # Grok-4: +18% over 30 days. Steady climb with small drawdowns.
-        # Target: starts at 10000, ends at 11800
-        # Path: gentle upward with a couple small dips
-        target = []
-        for i in range(n_points):
-            t = i / (n_points - 1)  # 0 to 1
-            # Main upward trend
-            base = 10000 + 1800 * t
-            # Add a small dip around day 8-10 (t=0.27-0.33)
-            dip1 = -200 * math.exp(-((t - 0.30) ** 2) / (2 * 0.02 ** 2))
-            # Another small dip around day 20 (t=0.67)
-            dip2 = -150 * math.exp(-((t - 0.67) ** 2) / (2 * 0.015 ** 2))
-            # Acceleration in the middle
-            accel = 200 * math.sin(math.pi * t)
-            target.append(base + dip1 + dip2 + accel)
-
-        # Add small noise
-        noisy = [v + random.gauss(0, 20) for v in target]
-        return [round(v, 2) for v in smooth_curve(noisy, 3)]
-
-    elif personality == "conservative":
-        # GPT-5: +8% over 30 days. Very smooth, almost linear.
-        target = []
-        for i in range(n_points):
-            t = i / (n_points - 1)
-            base = 10000 + 800 * t
-            # Tiny seasonal variation
-            wave = 50 * math.sin(2 * math.pi * t * 3)
-            # One small flat period around day 15
-            flat = -80 * math.exp(-((t - 0.5) ** 2) / (2 * 0.05 ** 2))
-            target.append(base + wave + flat)
-
-        noisy = [v + random.gauss(0, 10) for v in target]
-        return [round(v, 2) for v in smooth_curve(noisy, 3)]
-
-    elif personality == "volatile":
-        # Gemini: +3% final, but swings ±15%. Roller coaster.
-        target = []
-        for i in range(n_points):
-            t = i / (n_points - 1)
-            # Final target: 10300
-            base = 10000 + 300 * t
-            # Big swings
-            swing1 = 800 * math.sin(2 * math.pi * t * 1.5)       # Up to +8%, oscillating
-            swing2 = 500 * math.sin(2 * math.pi * t * 3.2 + 1)   # Faster oscillation
-            swing3 = -600 * math.exp(-((t - 0.55) ** 2) / (2 * 0.04 ** 2))  # Big crash mid-month
-            swing4 = 400 * math.exp(-((t - 0.35) ** 2) / (2 * 0.03 ** 2))   # Big rally
-            target.append(base + swing1 + swing2 + swing3 + swing4)
-
-        noisy = [v + random.gauss(0, 35) for v in target]
-        return [round(v, 2) for v in smooth_curve(noisy, 3)]
-
-    elif personality == "underperformer":
-        # DeepSeek: -5% final. Good start, then bad week, partial recovery.
-        target = []
-        for i in range(n_points):
-            t = i / (n_points - 1)
-            # Rises to +6% by day 10-12, crashes to -10% by day 20, recovers to -5%
-            base = 10000
-            # Initial rise
-            rise = 600 * math.sin(math.pi * min(t / 0.4, 1)) if t < 0.4 else 600 * math.exp(-3 * (t - 0.4))
-            # Big drawdown
-            crash = -1200 * max(0, math.sin(math.pi * max(0, (t - 0.4)) / 0.35)) if 0.4 < t < 0.75 else 0
-            # Recovery
-            recovery = 300 * max(0, (t - 0.75)) / 0.25 if t > 0.75 else 0
-            # Adjust to hit -5% at end
-            target.append(base + rise + crash + recovery - 100 * t)
-
-        noisy = [v + random.gauss(0, 18) for v in target]
-        result = [round(v, 2) for v in smooth_curve(noisy, 3)]
+    if personality not in PERSONALITIES:
+        return [INITIAL_BALANCE] * n_points
+
+    components, sigma = PERSONALITIES[personality]
+    kinds = np.array([comp[0] for comp in components], dtype=np.int64)
+    params = np.array([comp[1:] for comp in components], dtype=np.float64)
+    target = _build_target(np.linspace(0, 1, n_points), kinds, params)  # t: 0 to 1
+    noisy = target + rng.normal(0, sigma, n_points)
+    result = np.round(smooth_curve(noisy, 3), 2)
+
+    if personality == "underperformer":
         # Adjust final point to be close to 9500
         offset = 9500 - result[-1]
         # Gradually apply offset over last 20% of points
         n_adjust = n_points // 5
-        for i in range(n_adjust):
-            idx = n_points - n_adjust + i
-            factor = i / n_adjust
-            result[idx] = round(result[idx] + offset * factor, 2)
-        return result
+        factors = np.arange(n_adjust) / n_adjust
+        result[n_points - n_adjust:] = np.round(result[n_points - n_adjust:] + offset * factors, 2)
 
-    return [INITIAL_BALANCE] * n_points
+    return result.tolist()
 
 
-def generate_positions(trader_type, balance, step, total_steps, coin_prices):
-    """Generate realistic open positions for a trader at a given step."""
+# Uniform draws taken once per cycle / once per position slot (see draw_tables)
+CYCLE_DRAWS = (
+    "open", "n_pos", "act", "wait", "reason", "close", "close_pick",
+    "coin", "slip", "long", "open_lev", "open_size", "ai_dur",
+)
+POSITION_DRAWS = ("pick", "offset", "lev", "side", "size")
+MAX_POSITIONS = 3
+
+
+def draw_tables(rng, n):
+    """
+    Pre-draw every random number a trader needs for n cycles.
+    Returns dict of name -> per-step list; position draws hold MAX_POSITIONS values per step.
+    """
+    tables = {name: rng.random(n).tolist() for name in CYCLE_DRAWS}
+    tables.update({name: rng.random((n, MAX_POSITIONS)).tolist() for name in POSITION_DRAWS})
+    tables["order_id"] = rng.integers(100000, 1000000, n).tolist()
+    return tables
+
+
+def _uniform(lo, hi, u):
+    """Map a uniform [0, 1) draw onto [lo, hi)."""
+    return lo + (hi - lo) * u
+
+
+def _pick(seq, u):
+    """Map a uniform [0, 1) draw onto one element of seq."""
+    return seq[int(u * len(seq))]
+
+
+def _weighted(seq, cum_weights, u):
+    """Map a uniform [0, 1) draw onto seq by its cumulative weights (last one must be 1.0)."""
+    return seq[bisect(cum_weights, u)]
+
+
+def _sample(pool, k, us):
+    """Pick k distinct elements of pool, one uniform draw per element."""
+    pool = list(pool)
+    return [pool.pop(int(u * len(pool))) for u in us[:k]]
+
+
+def _position(coin, side, entry_price, mark_price, qty, leverage, size_usd, price_dec=2):
+    """
+    Build a position dict for coin (an index into CANDIDATE_COINS), rounding the derived fields in one place.
+    mark_price comes from precompute_prices already rounded, so it is used as is.
+    """
+    move = (mark_price - entry_price) if side == "long" else (entry_price - mark_price)
+    return {
+        "symbol": CANDIDATE_COINS[coin], "side": side,
+        "entry_price": round(entry_price, price_dec),
+        "mark_price": mark_price,
+        "quantity": qty, "leverage": leverage,
+        "unrealized_pnl": round(move * qty, 2),
+        "margin": round(size_usd / leverage, 2),
+    }
+
+
+def generate_positions(trader_type, balance, step, total_steps, coin_prices, draws):
+    """
+    Generate realistic open positions for a trader at a given step.
+    coin_prices is the step's price row, indexed by coin index.
+    Returns (positions, (total unrealized PnL, total margin)).
+    """
     positions = []
+    unrealized = total_margin = 0
     t = step / total_steps
+    picks = draws["pick"][step]
+    offsets = draws["offset"][step]
+    levs = draws["lev"][step]
+    sides = draws["side"][step]
+    sizes = draws["size"][step]
 
     if trader_type == "grok4":
-        if random.random() < 0.55:
-            coins = random.sample(["BTCUSDT", "ETHUSDT"], k=random.choices([1, 2], weights=[0.6, 0.4])[0])
-            for coin in coins:
-                entry_offset = random.uniform(-0.02, 0.015)
+        if draws["open"][step] < 0.55:
+            coins = _sample(BTC_ETH, _weighted((1, 2), UP_TO_2_CUM_WEIGHTS, draws["n_pos"][step]), picks)
+            for j, coin in enumerate(coins):
+                entry_offset = _uniform(-0.02, 0.015, offsets[j])
                 entry_price = coin_prices[coin] * (1 + entry_offset)
                 current_price = coin_prices[coin]
-                leverage = random.choice([3, 5])
-                direction = "long" if random.random() < 0.75 else "short"
+                leverage = _pick((3, 5), levs[j])
+                direction = "long" if sides[j] < 0.75 else "short"
 
-                size_usd = random.uniform(50000, 80000) if coin == "BTCUSDT" else random.uniform(30000, 50000)
+                size_usd = _uniform(50000, 80000, sizes[j]) if coin == BTC else _uniform(30000, 50000, sizes[j])
                 qty = round(size_usd / entry_price, 3)
-
-                unrealized = ((current_price - entry_price) if direction == "long" else (entry_price - current_price)) * qty
-                positions.append({
-                    "symbol": coin, "side": direction,
-                    "entry_price": round(entry_price, 2),
-                    "mark_price": round(current_price, 2),
-                    "quantity": qty, "leverage": leverage,
-                    "unrealized_pnl": round(unrealized, 2),
-                    "margin": round(size_usd / leverage, 2),
-                })
+                pos = _position(coin, direction, entry_price, current_price, qty, leverage, size_usd)
+                positions.append(pos)
+                unrealized += pos["unrealized_pnl"]
+                total_margin += pos["margin"]
 
     elif trader_type == "gpt5":
-        if random.random() < 0.35:
-            coin = random.choice(["BTCUSDT", "ETHUSDT"])
-            entry_offset = random.uniform(-0.015, 0.01)
+        if draws["open"][step] < 0.35:
+            coin = _pick(BTC_ETH, picks[0])
+            entry_offset = _uniform(-0.015, 0.01, offsets[0])
             entry_price = coin_prices[coin] * (1 + entry_offset)
             current_price = coin_prices[coin]
-            leverage = random.choice([2, 3])
+            leverage = _pick((2, 3), levs[0])
 
-            size_usd = random.uniform(30000, 50000) if coin == "BTCUSDT" else random.uniform(20000, 30000)
+            size_usd = _uniform(30000, 50000, sizes[0]) if coin == BTC else _uniform(20000, 30000, sizes[0])
             qty = round(size_usd / entry_price, 3)
-            unrealized = (current_price - entry_price) * qty
-            positions.append({
-                "symbol": coin, "side": "long",
-                "entry_price": round(entry_price, 2),
-                "mark_price": round(current_price, 2),
-                "quantity": qty, "leverage": leverage,
-                "unrealized_pnl": round(unrealized, 2),
-                "margin": round(size_usd / leverage, 2),
-            })
+            pos = _position(coin, "long", entry_price, current_price, qty, leverage, size_usd)
+            positions.append(pos)
+            unrealized += pos["unrealized_pnl"]
+            total_margin += pos["margin"]
 
     elif trader_type == "gemini":
-        if random.random() < 0.65:
-            n_pos = random.choices([1, 2, 3], weights=[0.3, 0.4, 0.3])[0]
-            pool = ["SOLUSDT", "BTCUSDT", "ETHUSDT", "DOGEUSDT", "BNBUSDT", "XRPUSDT"]
-            coins = random.sample(pool, k=min(n_pos, len(pool)))
-            for coin in coins:
-                entry_offset = random.uniform(-0.04, 0.025)
+        if draws["open"][step] < 0.65:
+            n_pos = _weighted((1, 2, 3), UP_TO_3_CUM_WEIGHTS, draws["n_pos"][step])
+            coins = _sample(GEMINI_POOL, min(n_pos, len(GEMINI_POOL)), picks)
+            for j, coin in enumerate(coins):
+                entry_offset = _uniform(-0.04, 0.025, offsets[j])
                 entry_price = coin_prices[coin] * (1 + entry_offset)
                 current_price = coin_prices[coin]
-                leverage = random.choice([2, 3])
-                direction = random.choice(["long", "short"])
+                leverage = _pick((2, 3), levs[j])
+                direction = _pick(("long", "short"), sides[j])
 
-                if coin == "BTCUSDT":
-                    size_usd = random.uniform(40000, 70000)
-                elif coin == "ETHUSDT":
-                    size_usd = random.uniform(25000, 45000)
+                if coin == BTC:
+                    size_usd = _uniform(40000, 70000, sizes[j])
+                elif coin == ETH:
+                    size_usd = _uniform(25000, 45000, sizes[j])
                 else:
-                    size_usd = random.uniform(8000, 15000)
+                    size_usd = _uniform(8000, 15000, sizes[j])
 
                 decimals = 4 if coin_prices[coin] < 1 else (3 if coin_prices[coin] < 100 else 3)
                 qty = round(size_usd / entry_price, decimals)
-                unrealized = ((current_price - entry_price) if direction == "long" else (entry_price - current_price)) * qty
-
                 price_decimals = 6 if coin_prices[coin] < 1 else 2
-                positions.append({
-                    "symbol": coin, "side": direction,
-                    "entry_price": round(entry_price, price_decimals),
-                    "mark_price": round(current_price, price_decimals),
-                    "quantity": qty, "leverage": leverage,
-                    "unrealized_pnl": round(unrealized, 2),
-                    "margin": round(size_usd / leverage, 2),
-                })
+                pos = _position(coin, direction, entry_price, current_price, qty, leverage, size_usd, price_decimals)
+                positions.append(pos)
+                unrealized += pos["unrealized_pnl"]
+                total_margin += pos["margin"]
 
     elif trader_type == "deepseek":
-        if random.random() < 0.45:
-            n_pos = random.choices([1, 2], weights=[0.6, 0.4])[0]
-            coins = random.sample(["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT"], k=n_pos)
-            for coin in coins:
-                entry_offset = random.uniform(-0.035, 0.02)
+        if draws["open"][step] < 0.45:
+            n_pos = _weighted((1, 2), UP_TO_2_CUM_WEIGHTS, draws["n_pos"][step])
+            coins = _sample(DEEPSEEK_POOL, n_pos, picks)
+            for j, coin in enumerate(coins):
+                entry_offset = _uniform(-0.035, 0.02, offsets[j])
                 entry_price = coin_prices[coin] * (1 + entry_offset)
                 current_price = coin_prices[coin]
-                leverage = random.choice([3, 5]) if coin in ["BTCUSDT", "ETHUSDT"] else random.choice([2, 3])
-                direction = random.choice(["long", "short"])
+                leverage = _pick((3, 5), levs[j]) if coin in BTC_ETH_SET else _pick((2, 3), levs[j])
+                direction = _pick(("long", "short"), sides[j])
 
-                if coin == "BTCUSDT":
-                    size_usd = random.uniform(40000, 60000)
-                elif coin == "ETHUSDT":
-                    size_usd = random.uniform(25000, 40000)
+                if coin == BTC:
+                    size_usd = _uniform(40000, 60000, sizes[j])
+                elif coin == ETH:
+                    size_usd = _uniform(25000, 40000, sizes[j])
                 else:
-                    size_usd = random.uniform(8000, 12000)
+                    size_usd = _uniform(8000, 12000, sizes[j])
 
                 qty = round(size_usd / entry_price, 3)
-                unrealized = ((current_price - entry_price) if direction == "long" else (entry_price - current_price)) * qty
-                positions.append({
-                    "symbol": coin, "side": direction,
-                    "entry_price": round(entry_price, 2),
-                    "mark_price": round(current_price, 2),
-                    "quantity": qty, "leverage": leverage,
-                    "unrealized_pnl": round(unrealized, 2),
-                    "margin": round(size_usd / leverage, 2),
-                })
+                pos = _position(coin, direction, entry_price, current_price, qty, leverage, size_usd)
+                positions.append(pos)
+                unrealized += pos["unrealized_pnl"]
+                total_margin += pos["margin"]
 
-    return positions
+    return positions, (unrealized, total_margin)
 
 
-def generate_decisions(trader_type, positions, coin_prices):
+def generate_decisions(trader_type, positions, coin_prices, draws, step):
     """Generate trading decisions for a cycle."""
     actions = []
     execution_log = []
 
-    action_probs = {"grok4": 0.22, "gpt5": 0.10, "gemini": 0.32, "deepseek": 0.18}
-
-    if random.random() > action_probs.get(trader_type, 0.15):
-        action_type = random.choice(["wait", "hold"])
+    if draws["act"][step] > ACTION_PROBS.get(trader_type, 0.15):
+        action_type = _pick(("wait", "hold"), draws["wait"][step])
         actions.append({
             "action": action_type, "symbol": "ALL",
             "quantity": 0, "leverage": 0, "price": 0,
             "order_id": 0, "timestamp": "", "success": True, "error": ""
         })
-        reasons = [
-            "No high-confidence setup found",
-            "RSI near oversold, waiting for confirmation",
-            "Trend unclear, maintaining positions",
-            "Waiting for breakout confirmation",
-            "Market consolidating, holding",
-            "Risk-reward not favorable",
-            "Indicators conflicting, staying out",
-            "Volatility too low for entry",
-            "4h EMA20 ≈ EMA50, no clear trend",
-            "KEMAD and ZeroLag not aligned",
-        ]
-        execution_log.append(f"✓ ALL {action_type} — {random.choice(reasons)}")
+        reason = _pick(WAIT_REASONS, draws["reason"][step])
+        execution_log.append(f"✓ ALL {action_type} — {reason}")
         return actions, execution_log
 
     # Trade action
-    if positions and random.random() < 0.4:
-        pos = random.choice(positions)
+    if positions and draws["close"][step] < 0.4:
+        pos = _pick(positions, draws["close_pick"][step])
         close_action = f"close_{pos['side']}"
         actions.append({
             "action": close_action, "symbol": pos["symbol"],
             "quantity": pos["quantity"], "leverage": pos["leverage"],
             "price": pos["mark_price"],
-            "order_id": random.randint(100000, 999999),
+            "order_id": draws["order_id"][step],
             "timestamp": "", "success": True, "error": ""
         })
         pnl = pos['unrealized_pnl']
@@ -302,31 +415,26 @@ def generate_decisions(trader_type, positions, coin_prices):
     else:
         # Open new
         if trader_type == "gemini":
-            coin = random.choice(["SOLUSDT", "BTCUSDT", "ETHUSDT", "DOGEUSDT", "BNBUSDT", "XRPUSDT"])
-        elif trader_type in ["grok4", "gpt5"]:
-            coin = random.choices(["BTCUSDT", "ETHUSDT", "SOLUSDT"], weights=[0.5, 0.35, 0.15])[0]
+            coin = _pick(GEMINI_POOL, draws["coin"][step])
+        elif trader_type in ("grok4", "gpt5"):
+            coin = _weighted(MAJORS, MAJORS_CUM_WEIGHTS, draws["coin"][step])
         else:
-            coin = random.choice(["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT"])
+            coin = _pick(DEEPSEEK_POOL, draws["coin"][step])
 
-        price = coin_prices.get(coin, 100)
-        price_with_slippage = price * (1 + random.uniform(-0.002, 0.002))
+        price = coin_prices[coin]
+        symbol = CANDIDATE_COINS[coin]
+        price_with_slippage = price * (1 + _uniform(-0.002, 0.002, draws["slip"][step]))
 
-        dir_map = {
-            "grok4": (0.72, [3, 5], [3, 5]),
-            "gpt5": (0.82, [2, 3], [2, 3]),
-            "gemini": (0.50, [2, 3], [2, 3]),
-            "deepseek": (0.55, [3, 5], [2, 3]),
-        }
-        long_prob, btc_lev, alt_lev = dir_map.get(trader_type, (0.5, [3], [2]))
-        direction = "open_long" if random.random() < long_prob else "open_short"
-        leverage = random.choice(btc_lev if coin in ["BTCUSDT", "ETHUSDT"] else alt_lev)
+        long_prob, btc_lev, alt_lev = DIRECTION_PROFILES.get(trader_type, DEFAULT_DIRECTION_PROFILE)
+        direction = "open_long" if draws["long"][step] < long_prob else "open_short"
+        leverage = _pick(btc_lev if coin in BTC_ETH_SET else alt_lev, draws["open_lev"][step])
 
-        if coin == "BTCUSDT":
-            size_usd = random.uniform(50000, 80000)
-        elif coin == "ETHUSDT":
-            size_usd = random.uniform(30000, 50000)
+        if coin == BTC:
+            size_usd = _uniform(50000, 80000, draws["open_size"][step])
+        elif coin == ETH:
+            size_usd = _uniform(30000, 50000, draws["open_size"][step])
         else:
-            size_usd = random.uniform(8000, 15000)
+            size_usd = _uniform(8000, 15000, draws["open_size"][step])
 
         if price > 1000:
             qty = round(size_usd / price_with_slippage, 3)
@@ -337,68 +445,87 @@ def generate_decisions(trader_type, positions, coin_prices):
 
         price_dec = 6 if price < 1 else 2
         actions.append({
-            "action": direction, "symbol": coin,
+            "action": direction, "symbol": symbol,
             "quantity": qty, "leverage": leverage,
             "price": round(price_with_slippage, price_dec),
-            "order_id": random.randint(100000, 999999),
+            "order_id": draws["order_id"][step],
             "timestamp": "", "success": True, "error": ""
         })
         side_str = "LONG" if "long" in direction else "SHORT"
-        execution_log.append(f"Opened {side_str} {coin} x{leverage} @ {round(price_with_slippage, price_dec)} ({round(size_usd)} USDT)")
+        execution_log.append(f"Opened {side_str} {symbol} x{leverage} @ {round(price_with_slippage, price_dec)} ({round(size_usd)} USDT)")
 
     return actions, execution_log
 
 
-def simulate_coin_prices(step, total_steps):
-    """Simulate realistic coin price evolution over time."""
-    prices = {}
-    t = step / max(total_steps - 1, 1)
+def precompute_prices(n, rng):
+    """
+    Simulate realistic coin price evolution over the whole timeline at once.
+    Returns an (n, len(CANDIDATE_COINS)) array with one column per coin index.
+    """
+    prices = np.empty((n, len(CANDIDATE_COINS)))
+    t = np.linspace(0, 1, n)
 
     for coin, base in COIN_PRICES_BASE.items():
         # Each coin has unique price trajectory
         if coin == "BTCUSDT":
-            drift = base * (0.06 * math.sin(2 * math.pi * t * 1.5) + 0.04 * t + 0.02 * math.sin(2 * math.pi * t * 4))
+            drift = base * (0.06 * np.sin(2 * np.pi * t * 1.5) + 0.04 * t + 0.02 * np.sin(2 * np.pi * t * 4))
         elif coin == "ETHUSDT":
-            drift = base * (0.08 * math.sin(2 * math.pi * t * 1.2 + 0.5) + 0.03 * t)
+            drift = base * (0.08 * np.sin(2 * np.pi * t * 1.2 + 0.5) + 0.03 * t)
         elif coin == "SOLUSDT":
-            drift = base * (0.12 * math.sin(2 * math.pi * t * 2.0 + 1.0) + 0.02 * t)
+            drift = base * (0.12 * np.sin(2 * np.pi * t * 2.0 + 1.0) + 0.02 * t)
         elif coin == "BNBUSDT":
-            drift = base * (0.05 * math.sin(2 * math.pi * t * 1.0 + 0.3) + 0.01 * t)
+            drift = base * (0.05 * np.sin(2 * np.pi * t * 1.0 + 0.3) + 0.01 * t)
         elif coin == "DOGEUSDT":
-            drift = base * (0.18 * math.sin(2 * math.pi * t * 2.5 + 2.0) + 0.01 * t)
+            drift = base * (0.18 * np.sin(2 * np.pi * t * 2.5 + 2.0) + 0.01 * t)
         elif coin == "XRPUSDT":
-            drift = base * (0.10 * math.sin(2 * math.pi * t * 1.8 + 1.5) + 0.02 * t)
+            drift = base * (0.10 * np.sin(2 * np.pi * t * 1.8 + 1.5) + 0.02 * t)
         elif coin == "ADAUSDT":
-            drift = base * (0.08 * math.sin(2 * math.pi * t * 1.3 + 0.8) + 0.01 * t)
+            drift = base * (0.08 * np.sin(2 * np.pi * t * 1.3 + 0.8) + 0.01 * t)
         else:
-            drift = base * (0.07 * math.sin(2 * math.pi * t * 1.5 + 1.2) + 0.02 * t)
+            drift = base * (0.07 * np.sin(2 * np.pi * t * 1.5 + 1.2) + 0.02 * t)
 
-        noise = base * random.gauss(0, 0.003)
-        p = base + drift + noise
-        prices[coin] = round(p, 6 if base < 1 else 2)
+        noise = rng.normal(0, base * 0.003, n)
+        prices[:, COIN_IDX[coin]] = np.round(base + drift + noise, 6 if base < 1 else 2)
     return prices
 
 
-def create_record(timestamp, cycle_num, trader_type, balance, positions, coin_prices):
+def dump_record(record):
+    """Serialize a decision record to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        data = orjson.dumps(record)
+    else:
+        data = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return data.replace(CANDIDATE_COINS_TOKEN, CANDIDATE_COINS_JSON, 1)
+
+
+def write_file(name, data, dir_fd):
+    """Write bytes to name (relative to the open directory dir_fd) with a single unbuffered write."""
+    fd = os.open(name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def create_record(timestamp_iso, cycle_num, trader_type, balance, positions, totals, coin_prices, draws):
     """Create a single decision log record."""
-    unrealized = sum(p.get("unrealized_pnl", 0) for p in positions)
-    total_margin = sum(p.get("margin", 0) for p in positions)
+    unrealized, total_margin = totals
     available = max(balance - total_margin, 0)
     margin_pct = round(total_margin / balance * 100, 1) if balance > 0 else 0
     margin_pct = min(margin_pct, 90)
 
-    decisions, exec_log = generate_decisions(trader_type, positions, coin_prices)
+    step = cycle_num - 1
+    decisions, exec_log = generate_decisions(trader_type, positions, coin_prices, draws, step)
 
     for d in decisions:
-        d["timestamp"] = timestamp.isoformat()
+        d["timestamp"] = timestamp_iso
 
-    dur_ranges = {"grok4": (2000, 8000), "gpt5": (3000, 12000), "gemini": (2500, 10000), "deepseek": (4000, 15000)}
-    lo, hi = dur_ranges.get(trader_type, (3000, 8000))
-    ai_duration = random.randint(lo, hi)
+    lo, hi = AI_DURATION_RANGES.get(trader_type, (3000, 8000))
+    ai_duration = lo + int(draws["ai_dur"][step] * (hi - lo + 1))
     exec_log.insert(0, f"AI调用耗时: {ai_duration} ms")
 
     return {
-        "timestamp": timestamp.isoformat(),
+        "timestamp": timestamp_iso,
         "cycle_number": cycle_num,
         "system_prompt": "",
         "input_prompt": "",
@@ -412,7 +539,7 @@ def create_record(timestamp, cycle_num, trader_type, balance, positions, coin_pr
             "margin_used_pct": margin_pct,
         },
         "positions": positions if positions else None,
-        "candidate_coins": CANDIDATE_COINS,
+        "candidate_coins": CANDIDATE_COINS_PLACEHOLDER,  # spliced in by dump_record
         "decisions": decisions,
         "execution_log": exec_log,
         "success": True,
@@ -421,8 +548,105 @@ def create_record(timestamp, cycle_num, trader_type, balance, positions, coin_pr
     }
 
 
+def write_trader(trader_key, full_dir, balances, coin_prices_by_step, ts_iso, fnames, seed, ndjson=False):
+    """Write all decision log files for one trader. Runs in a worker process."""
+    draws = draw_tables(np.random.default_rng(seed), len(ts_iso))
+    trader_dir = os.path.basename(full_dir)
+
+    # Clear existing
+    if os.path.exists(full_dir):
+        dir_fd = os.open(full_dir, os.O_RDONLY | os.O_DIRECTORY)
+        cleared = 0
+        with os.scandir(dir_fd) as entries:
+            for entry in entries:
+                if entry.name.endswith(('.json', '.ndjson')):
+                    os.unlink(entry.name, dir_fd=dir_fd)
+                    cleared += 1
+        status = f"Cleared {cleared} existing files from {trader_dir}"
+    else:
+        os.makedirs(full_dir, exist_ok=True)
+        dir_fd = os.open(full_dir, os.O_RDONLY | os.O_DIRECTORY)
+        status = f"Created {trader_dir}"
+
+    try:
+        count = write_records(trader_key, balances, coin_prices_by_step, ts_iso, fnames, draws, dir_fd, ndjson)
+    finally:
+        os.close(dir_fd)
+    return status, count
+
+
+def write_records(trader_key, balances, coin_prices_by_step, ts_iso, fnames, draws, dir_fd, ndjson=False):
+    """
+    Generate one decision record per timestamp into the open directory dir_fd.
+    Writes one file per record, or appends them all to NDJSON_NAME when ndjson is set.
+    """
+    n = len(ts_iso)
+    count = 0
+    out_fd = None
+    if ndjson:
+        out_fd = os.open(NDJSON_NAME, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd)
+
+    # Serialize here while a writer thread does the file I/O
+    pending = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+    errors = []
+    writer = threading.Thread(target=_write_queued, args=(pending, dir_fd, out_fd, errors))
+    writer.start()
+
+    try:
+        for i in range(n):
+            balance = balances[i]
+            coin_prices = coin_prices_by_step[i]
+            positions, totals = generate_positions(trader_key, balance, i, n, coin_prices, draws)
+            cycle_num = i + 1
+
+            record = create_record(ts_iso[i], cycle_num, trader_key, balance, positions, totals, coin_prices, draws)
+            if out_fd is None:
+                pending.put((fnames[i], dump_record(record)))
+            else:
+                pending.put((None, dump_record(record) + b"\n"))
+            count += 1
+    finally:
+        pending.put(None)
+        writer.join()
+        if out_fd is not None:
+            os.close(out_fd)
+
+    if errors:
+        raise errors[0]
+    return count
+
+
+def _write_queued(pending, dir_fd, out_fd, errors):
+    """
+    Writer thread for write_records: write (name, data) items until a None sentinel.
+    Items go to their own file in dir_fd, or are appended to out_fd when it is set.
+    After the first error the remaining items are drained unwritten and the error is left in errors.
+    """
+    while True:
+        item = pending.get()
+        if item is None:
+            return
+        if errors:
+            continue
+        name, data = item
+        try:
+            if out_fd is None:
+                write_file(name, data, dir_fd)
+            else:
+                os.write(out_fd, data)
+        except OSError as e:
+            errors.append(e)
+
+
 def main():
-    random.seed(42)
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--ndjson", action="store_true",
+        help=f"write one newline-delimited {NDJSON_NAME} per trader instead of a file per cycle",
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
 
     # Build timestamps
     timestamps = []
@@ -431,14 +655,20 @@ def main():
         timestamps.append(t)
         t += INTERVAL
     n = len(timestamps)
-    print(f"Generating {n} data points per trader ({n * 4} total files)")
+    # Format timestamps and file names once; they are the same for every trader
+    ts_iso = [ts.isoformat() for ts in timestamps]
+    fnames = [f"decision_{ts.strftime('%Y%m%d_%H%M%S')}_cycle{i + 1}.json" for i, ts in enumerate(timestamps)]
+    if args.ndjson:
+        print(f"Generating {n} data points per trader (one {NDJSON_NAME} per trader)")
+    else:
+        print(f"Generating {n} data points per trader ({n * 4} total files)")
 
     # Generate equity curves
     curves = {
-        "grok4": generate_equity_curve_v2(n, "star"),
-        "gpt5": generate_equity_curve_v2(n, "conservative"),
-        "gemini": generate_equity_curve_v2(n, "volatile"),
-        "deepseek": generate_equity_curve_v2(n, "underperformer"),
+        "grok4": generate_equity_curve_v2(n, "star", rng),
+        "gpt5": generate_equity_curve_v2(n, "conservative", rng),
+        "gemini": generate_equity_curve_v2(n, "volatile", rng),
+        "deepseek": generate_equity_curve_v2(n, "underperformer", rng),
     }
 
     labels = {"grok4": "Grok-4 (star)", "gpt5": "GPT-5 (conservative)", "gemini": "Gemini (volatile)", "deepseek": "DeepSeek (underperformer)"}
@@ -446,39 +676,30 @@ def main():
         print(f"  {labels[name]}: ${curve[0]:,.2f} → ${curve[-1]:,.2f} ({(curve[-1]/curve[0]-1)*100:+.1f}%)")
         print(f"    Min: ${min(curve):,.2f}, Max: ${max(curve):,.2f}")
 
-    # Generate files
-    for trader_key, trader_dir in TRADERS.items():
-        full_dir = os.path.join(BASE_DIR, trader_dir)
-
-        # Clear existing
-        if os.path.exists(full_dir):
-            existing = [f for f in os.listdir(full_dir) if f.endswith('.json')]
-            for f in existing:
-                os.remove(os.path.join(full_dir, f))
-            print(f"\nCleared {len(existing)} existing files from {trader_dir}")
-        else:
-            os.makedirs(full_dir, exist_ok=True)
-            print(f"\nCreated {trader_dir}")
-
-        balances = curves[trader_key]
-        count = 0
-
-        for i, ts in enumerate(timestamps):
-            balance = balances[i]
-            coin_prices = simulate_coin_prices(i, n)
-            positions = generate_positions(trader_key, balance, i, n, coin_prices)
-            cycle_num = i + 1
-
-            record = create_record(ts, cycle_num, trader_key, balance, positions, coin_prices)
-
-            fname = f"decision_{ts.strftime('%Y%m%d_%H%M%S')}_cycle{cycle_num}.json"
-            with open(os.path.join(full_dir, fname), 'w') as f:
-                json.dump(record, f, indent=2, ensure_ascii=False)
-            count += 1
-
-        print(f"  Wrote {count} files for {labels[trader_key]}")
-
-    print(f"\n✅ Done! Generated {n * 4} total decision log files across 4 traders")
+    # Simulate coin prices once; every trader sees the same market
+    prices = precompute_prices(n, rng)
+    coin_prices_by_step = prices.tolist()
+
+    # Generate files, one worker process per trader
+    trader_keys = list(TRADERS)
+    full_dirs = [os.path.join(BASE_DIR, TRADERS[k]) for k in trader_keys]
+    seeds = [42 + i for i in range(len(trader_keys))]
+    with ProcessPoolExecutor(max_workers=len(trader_keys)) as ex:
+        results = ex.map(
+            write_trader, trader_keys, full_dirs, [curves[k] for k in trader_keys],
+            repeat(coin_prices_by_step), repeat(ts_iso), repeat(fnames), seeds, repeat(args.ndjson),
+        )
+        for trader_key, (status, count) in zip(trader_keys, results):
+            print(f"\n{status}")
+            if args.ndjson:
+                print(f"  Wrote {count} records to {NDJSON_NAME} for {labels[trader_key]}")
+            else:
+                print(f"  Wrote {count} files for {labels[trader_key]}")
+
+    if args.ndjson:
+        print(f"\n✅ Done! Generated {n * 4} total decision log records across 4 traders")
+    else:
+        print(f"\n✅ Done! Generated {n * 4} total decision log files across 4 traders")
 
 
 if __name__ == "__main__":